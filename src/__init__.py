@@ -6,9 +6,31 @@ Digin 包入口與對外 API。
 - `main`：CLI 入口函數（對應 `digin` 命令）。
 
 用途：既支持命令行使用，也便於程序化集成到現有工作流。
+導出項在首次訪問時才導入，僅使用子模塊（如 traverser）時不必加載 CLI 依賴。
 """
 
-from .__main__ import main
-from .analyzer import CodebaseAnalyzer
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .__main__ import main
+    from .analyzer import CodebaseAnalyzer
 
 __all__ = ["CodebaseAnalyzer", "main"]
+
+# 導出名 -> 定義它的子模塊
+_LAZY_EXPORTS = {
+    "main": ".__main__",
+    "CodebaseAnalyzer": ".analyzer",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public API members lazily (PEP 562)."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,68 @@
+"""JSON 編解碼的可選加速。
+
+優先使用 orjson，其次 ujson，都未安裝時回退到標準庫 json。
+三者的輸出都是合法 JSON，非 ASCII 字符原樣保留；解析失敗時都拋出 ValueError 的子類。
+非字符串的字典鍵（None、數字、布爾）與標準庫一樣轉為字符串；
+orjson 無法編碼的值（如超出 64 位的整數）回退到標準庫編碼。
+"""
+
+from typing import Any, Union
+
+try:
+    import json as _stdlib_json
+
+    import orjson
+
+    # 與標準庫一致：None、數字與布爾類型的鍵轉為字符串
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Parse JSON text or UTF-8 bytes."""
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Serialize to a JSON string without escaping non-ASCII characters."""
+        return dumps_bytes(obj).decode("utf-8")
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 encoded JSON."""
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # orjson 的 JSONEncodeError 是 TypeError 的子類
+            return _stdlib_json.dumps(
+                obj, ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+
+except ImportError:
+    try:
+        import ujson
+
+        def loads(data: Union[str, bytes]) -> Any:
+            """Parse JSON text or UTF-8 bytes."""
+            return ujson.loads(data)
+
+        def dumps(obj: Any) -> str:
+            """Serialize to a JSON string without escaping non-ASCII characters."""
+            return ujson.dumps(obj, ensure_ascii=False)
+
+        def dumps_bytes(obj: Any) -> bytes:
+            """Serialize to compact UTF-8 encoded JSON."""
+            return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    except ImportError:
+        import json
+
+        def loads(data: Union[str, bytes]) -> Any:
+            """Parse JSON text or UTF-8 bytes."""
+            return json.loads(data)
+
+        def dumps(obj: Any) -> str:
+            """Serialize to a JSON string without escaping non-ASCII characters."""
+            return json.dumps(obj, ensure_ascii=False)
+
+        def dumps_bytes(obj: Any) -> bytes:
+            """Serialize to compact UTF-8 encoded JSON."""
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+                "utf-8"
+            )
@@ -195,7 +195,7 @@ def call_claude_cli(
             model = "haiku"
         cmd.extend(["--model", model])
 
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     logger = get_logger("ai_client")
     logger.info(f"Starting Claude CLI call for directory: {directory}")
 
@@ -272,7 +272,7 @@ def call_gemini_cli(
 
     cmd.extend(["-p", prompt])
 
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     logger = get_logger("ai_client")
     logger.info(f"Starting Gemini CLI call for directory: {directory}")
 
@@ -123,6 +123,7 @@ class CodebaseAnalyzer:
             raise RuntimeError(error_msg) from e
 
         finally:
+            self.traverser.close()
             self.stats["end_time"] = time.time()
             duration = self.stats["end_time"] - self.stats["start_time"]
             self.logger.info(
@@ -312,9 +313,12 @@ class CodebaseAnalyzer:
 
         # Estimate file counts
         total_files = 0
-        for directory in analysis_order[:10]:  # Sample first 10
-            dir_info = self.traverser.collect_directory_info(directory)
-            total_files += dir_info.get("total_files", 0)
+        try:
+            for directory in analysis_order[:10]:  # Sample first 10
+                dir_info = self.traverser.collect_directory_info(directory)
+                total_files += dir_info.get("total_files", 0)
+        finally:
+            self.traverser.close()
 
         # Extrapolate if we have more directories
         if len(analysis_order) > 10:
@@ -47,6 +47,7 @@ class DigginSettings:
     # Analysis settings
     cache_enabled: bool = True
     parallel_workers: int = 1
+    traversal_workers: int = 1
     max_depth: int = 10
     verbose: bool = False
     narrative_enabled: bool = True
@@ -193,6 +194,7 @@ class ConfigManager:
             "api_options": {"model": "gemini-1.5-pro", "max_tokens": 4000},
             "cache_enabled": True,
             "parallel_workers": 1,
+            "traversal_workers": 1,
             "max_depth": 10,
             "verbose": False,
             "logging": {
@@ -6,13 +6,14 @@
 - 移除複雜的單例模式，使用標準 logging
 """
 
-import json
 import logging
 import logging.handlers
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
+
+from ._json import dumps
 
 # Global storage for logging configuration
 _logging_configured = False
@@ -21,6 +22,9 @@ _ai_log_format = "readable"
 _ai_log_detail_level = "summary"
 _ai_log_prompt_max_chars = 200
 
+# logging.getLogger always returns the same instance, so bind it once
+_ai_command_logger = logging.getLogger("digin.ai_commands")
+
 
 def setup_logging(
     log_dir: str = "logs",
@@ -96,6 +100,52 @@ def setup_logging(
     _logging_configured = True
 
 
+class FormatOnceRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that formats each record only once.
+
+    The stdlib handler formats a record twice per emit: once in
+    ``shouldRollover`` to measure it and again when writing it out.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._last_record: Optional[logging.LogRecord] = None
+        self._last_text = ""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            super().emit(record)
+        finally:
+            # Don't keep the record (and any traceback it carries) alive
+            # after it has been written
+            self._last_record = None
+            self._last_text = ""
+
+    def format(self, record: logging.LogRecord) -> str:
+        # emit() runs under the handler lock, so the cache is thread-safe
+        if record is not self._last_record:
+            self._last_text = super().format(record)
+            self._last_record = record
+        return self._last_text
+
+
+class JsonMessage:
+    """Log message wrapping a structured payload, JSON-encoded on first use.
+
+    Encoding happens only if a handler actually emits the record, and at
+    most once however many times the record is formatted.
+    """
+
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self.payload = payload
+        self._encoded: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._encoded is None:
+            self._encoded = dumps(self.payload)
+        return self._encoded
+
+
 def setup_file_logger(
     name: str,
     filename: Path,
@@ -113,7 +163,7 @@ def setup_file_logger(
         logger.removeHandler(handler)
 
     # Create rotating file handler
-    handler = logging.handlers.RotatingFileHandler(
+    handler = FormatOnceRotatingFileHandler(
         filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
     )
     handler.setFormatter(formatter)
@@ -143,23 +193,35 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(full_name)
 
 
+def _elapsed_ms(start_time: Union[int, float]) -> int:
+    """Milliseconds since a perf_counter_ns() or legacy time.time() start."""
+    if isinstance(start_time, int):
+        return (time.perf_counter_ns() - start_time) // 1_000_000
+    return int((time.time() - start_time) * 1000)
+
+
 def log_ai_command(
     provider: str,
     command: List[str],
     prompt_size: int,
     directory: str,
-    start_time: float,
+    start_time: Union[int, float],
     success: bool,
     response_size: int,
     error_msg: str,
     prompt: str,
 ) -> None:
-    """Log AI command execution details."""
-    if not _ai_logging_enabled:
+    """Log AI command execution details.
+
+    `start_time` is a `time.perf_counter_ns()` reading; float `time.time()`
+    values from older callers are still accepted.
+    """
+    # Bail out before building the message when INFO records would be dropped
+    if not _ai_logging_enabled or not _ai_command_logger.isEnabledFor(logging.INFO):
         return
 
-    duration = time.time() - start_time
-    logger = get_logger("ai_commands")
+    duration_ms = _elapsed_ms(start_time)
+    duration = duration_ms / 1000
 
     if _ai_log_format == "readable":
         # Human-readable format
@@ -180,7 +242,7 @@ def log_ai_command(
                 f" | Command: {' '.join(command)} | Prompt preview: {truncated_prompt}"
             )
 
-        logger.info(log_msg)
+        _ai_command_logger.info(log_msg)
     else:
         # JSON format for detailed analysis
         log_data = {
@@ -189,6 +251,7 @@ def log_ai_command(
             "command": command,
             "directory": directory,
             "duration_seconds": round(duration, 2),
+            "duration_ms": duration_ms,
             "prompt_size": prompt_size,
             "response_size": response_size,
             "success": success,
@@ -198,4 +261,4 @@ def log_ai_command(
         if _ai_log_detail_level == "full":
             log_data["prompt_preview"] = prompt[:_ai_log_prompt_max_chars]
 
-        logger.info(json.dumps(log_data, ensure_ascii=False))
+        _ai_command_logger.info(JsonMessage(log_data))
@@ -9,31 +9,69 @@
 設計理念：幫助新人快速理解代碼庫結構，找到最佳的學習路徑。
 """
 
-import json
+import os
+import sys
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from collections import defaultdict
 
+from ._json import loads
 from .config import DigginSettings
 from .logger import get_logger
 
+# TreeNode.flags 位標記
+ONBOARDING_PATH_FLAG = 1
+RECOMMENDED_READING_FLAG = 2
+
 
 @dataclass
 class TreeNode:
-    """項目樹節點，表示一個目錄或模塊。"""
+    """項目樹節點，表示一個目錄或模塊。
+
+    引導路徑與推薦閱讀標記共用一個整數位域 `flags`，
+    通過同名屬性讀寫。
+    """
 
     name: str
     path: str
     kind: str
     summary: str
-    capabilities: List[str] = field(default_factory=list)
+    capabilities: Sequence[str] = ()  # 共享空元組，避免為每個節點分配空列表
     confidence: int = 0
     importance_score: float = 0.0
     children: List["TreeNode"] = field(default_factory=list)
     narrative: Optional[Dict[str, str]] = None
-    is_onboarding_path: bool = False
-    is_recommended_reading: bool = False
+    flags: int = 0
+
+    def __post_init__(self) -> None:
+        # kind 取值很少，駐留後相同取值共享同一對象，比較與計數更快
+        if isinstance(self.kind, str):
+            self.kind = sys.intern(self.kind)
+
+    @property
+    def is_onboarding_path(self) -> bool:
+        return bool(self.flags & ONBOARDING_PATH_FLAG)
+
+    @is_onboarding_path.setter
+    def is_onboarding_path(self, value: bool) -> None:
+        self._set_flag(ONBOARDING_PATH_FLAG, value)
+
+    @property
+    def is_recommended_reading(self) -> bool:
+        return bool(self.flags & RECOMMENDED_READING_FLAG)
+
+    @is_recommended_reading.setter
+    def is_recommended_reading(self, value: bool) -> None:
+        self._set_flag(RECOMMENDED_READING_FLAG, value)
+
+    def _set_flag(self, flag: int, value: bool) -> None:
+        if value:
+            self.flags |= flag
+        else:
+            self.flags &= ~flag
 
 
 @dataclass
@@ -60,16 +98,54 @@ class ProjectMap:
     version: str = "1.0"
 
 
+# 閱讀時間與難度只取決於功能數量和置信度，取值組合有限，按組合緩存結果
+@lru_cache(maxsize=512)
+def _reading_time_for(capability_count: int, confidence: float) -> str:
+    """估算閱讀時間。"""
+    base_time = 10  # 基礎 10 分鐘
+    complexity_bonus = capability_count * 3
+    confidence_factor = (100 - confidence) / 100 * 5
+    total_time = base_time + complexity_bonus + confidence_factor
+    return f"{int(total_time)}-{int(total_time * 1.5)} 分鐘"
+
+
+@lru_cache(maxsize=512)
+def _difficulty_for(capability_count: int, confidence: float) -> str:
+    """評估難度。"""
+    if confidence >= 80 and capability_count <= 3:
+        return "easy"
+    elif confidence >= 60 and capability_count <= 6:
+        return "medium"
+    else:
+        return "hard"
+
+
+def _collect_nodes(tree: TreeNode) -> List[TreeNode]:
+    """按先序收集樹中所有節點（順序與遞歸遍歷一致）。
+
+    使用顯式棧，很深的目錄樹也不會觸及遞歸上限。
+    """
+    nodes = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(reversed(node.children))
+    return nodes
+
+
 class ProjectMapBuilder:
     """項目地圖構建器，負責從 digest 文件生成完整的項目地圖。"""
 
-    def __init__(self, settings: DigginSettings):
+    def __init__(self, settings: DigginSettings, executor: Optional[Executor] = None):
         """初始化項目地圖構建器。
 
         Args:
             settings: 配置設置
+            executor: 可選的執行器，用於並行讀取 digest 文件（由調用方持有和關閉）
         """
         self.settings = settings
+        self.executor = executor
         self.logger = get_logger("project_map")
 
     def build_project_map(self, root_path: Path) -> ProjectMap:
@@ -123,25 +199,40 @@ class ProjectMapBuilder:
             路徑到 digest 內容的映射
         """
         digest_files = {}
+        # rglob 產出的路徑與 root_path / 名稱 的字符串前綴相同，直接切片得到相對目錄，
+        # 避免構造 Path；前綴由拼接路徑得出，根路徑為 "." 時前綴為空串
+        root_prefix = str(root_path / "_")[:-1]
+
+        # 讀取與解析互不依賴，有執行器時並行進行；map 保持 rglob 的順序
+        paths = [str(digest_file) for digest_file in root_path.rglob("digest.json")]
+        if self.executor is not None and len(paths) > 1:
+            loaded = self.executor.map(self._load_digest_file, paths)
+        else:
+            loaded = map(self._load_digest_file, paths)
 
-        for digest_file in root_path.rglob("digest.json"):
-            try:
-                with open(digest_file, "r", encoding="utf-8") as f:
-                    digest_data = json.load(f)
-
-                relative_path = str(digest_file.parent.relative_to(root_path))
-                if relative_path == ".":
-                    relative_path = ""
+        for digest_file, digest_data in zip(paths, loaded):
+            if digest_data is None:
+                continue
 
-                digest_files[relative_path] = digest_data
-                self.logger.debug(f"Loaded digest: {relative_path}")
+            relative_file = digest_file[len(root_prefix) :]
+            relative_path = relative_file.rpartition(os.sep)[0].replace(os.sep, "/")
 
-            except (json.JSONDecodeError, OSError) as e:
-                self.logger.warning(f"Failed to load digest {digest_file}: {e}")
+            digest_files[relative_path] = digest_data
+            self.logger.debug(f"Loaded digest: {relative_path}")
 
         self.logger.info(f"Collected {len(digest_files)} digest files")
         return digest_files
 
+    def _load_digest_file(self, digest_file: str) -> Optional[Dict[str, Any]]:
+        """讀取並解析單個 digest 文件，失敗時記錄警告並返回 None。"""
+        try:
+            with open(digest_file, "rb") as f:
+                digest_data: Dict[str, Any] = loads(f.read())
+            return digest_data
+        except (ValueError, OSError) as e:
+            self.logger.warning(f"Failed to load digest {digest_file}: {e}")
+            return None
+
     def _build_tree_structure(
         self, root_path: Path, digest_files: Dict[str, Dict[str, Any]]
     ) -> TreeNode:
@@ -154,36 +245,34 @@ class ProjectMapBuilder:
         Returns:
             根節點
         """
-        # 創建路徑到節點的映射
+        # 第一遍：創建路徑到節點的映射
+        root_name = root_path.name
         nodes = {}
-
-        # 按路徑深度排序，確保父節點先創建
-        sorted_paths = sorted(digest_files.keys(), key=lambda p: len(p.split("/")))
-
-        for path, digest_data in [(p, digest_files[p]) for p in sorted_paths]:
-            node = TreeNode(
-                name=digest_data.get("name", path.split("/")[-1] if path else root_path.name),
+        for path, digest_data in digest_files.items():
+            nodes[path] = TreeNode(
+                name=digest_data.get("name", path.rpartition("/")[2] or root_name),
                 path=path,
                 kind=digest_data.get("kind", "unknown"),
                 summary=digest_data.get("summary", ""),
-                capabilities=digest_data.get("capabilities", []),
+                capabilities=digest_data.get("capabilities", ()),
                 confidence=digest_data.get("confidence", 0),
                 narrative=digest_data.get("narrative"),
             )
 
-            nodes[path] = node
-
-            # 找到父節點並建立關係
-            if path:  # 非根節點
-                parent_path = "/".join(path.split("/")[:-1])
-                if parent_path in nodes:
-                    nodes[parent_path].children.append(node)
-                elif "" in nodes:  # 直接添加到根節點
-                    nodes[""].children.append(node)
+        # 第二遍：通過字典查找父節點並建立關係
+        root = nodes.get("")
+        for path, node in nodes.items():
+            if not path:  # 根節點
+                continue
+            parent = nodes.get(path.rpartition("/")[0])
+            if parent is not None:
+                parent.children.append(node)
+            elif root is not None:  # 直接添加到根節點
+                root.children.append(node)
 
         # 返回根節點，如果沒有根 digest 則創建虛擬根節點
-        if "" in nodes:
-            return nodes[""]
+        if root is not None:
+            return root
         else:
             # 創建虛擬根節點
             root_node = TreeNode(
@@ -238,13 +327,8 @@ class ProjectMapBuilder:
 
             return score
 
-        def apply_scores(node: TreeNode) -> None:
-            """遞歸應用評分。"""
+        for node in _collect_nodes(tree):
             node.importance_score = calculate_node_score(node)
-            for child in node.children:
-                apply_scores(child)
-
-        apply_scores(tree)
         self.logger.debug("Calculated importance scores for all nodes")
 
     def _generate_onboarding_path(self, tree: TreeNode) -> OnboardingPath:
@@ -257,14 +341,7 @@ class ProjectMapBuilder:
             引導路徑
         """
 
-        def collect_nodes(node: TreeNode) -> List[TreeNode]:
-            """收集所有節點。"""
-            nodes = [node]
-            for child in node.children:
-                nodes.extend(collect_nodes(child))
-            return nodes
-
-        all_nodes = collect_nodes(tree)
+        all_nodes = _collect_nodes(tree)
 
         # 按重要性評分排序，選取前 5-7 個節點作為引導路徑
         sorted_nodes = sorted(all_nodes, key=lambda n: n.importance_score, reverse=True)
@@ -311,13 +388,7 @@ class ProjectMapBuilder:
             推薦閱讀列表
         """
 
-        def collect_nodes(node: TreeNode) -> List[TreeNode]:
-            nodes = [node]
-            for child in node.children:
-                nodes.extend(collect_nodes(child))
-            return nodes
-
-        all_nodes = collect_nodes(tree)
+        all_nodes = _collect_nodes(tree)
 
         # 選擇推薦閱讀：高置信度 + 豐富功能的節點
         recommended_nodes = [
@@ -363,18 +434,19 @@ class ProjectMapBuilder:
             統計信息
         """
 
-        def collect_nodes(node: TreeNode) -> List[TreeNode]:
-            nodes = [node]
-            for child in node.children:
-                nodes.extend(collect_nodes(child))
-            return nodes
+        all_nodes = _collect_nodes(tree)
 
-        all_nodes = collect_nodes(tree)
-
-        # 按類型分組統計
+        # 按類型分組統計，同時在同一次遍歷中統計標記
         kind_counts = defaultdict(int)
+        onboarding_count = 0
+        recommended_count = 0
         for node in all_nodes:
             kind_counts[node.kind] += 1
+            if node.flags:
+                if node.flags & ONBOARDING_PATH_FLAG:
+                    onboarding_count += 1
+                if node.flags & RECOMMENDED_READING_FLAG:
+                    recommended_count += 1
 
         # 計算平均置信度
         avg_confidence = (
@@ -388,10 +460,8 @@ class ProjectMapBuilder:
             "total_digests": len(digest_files),
             "kind_distribution": dict(kind_counts),
             "average_confidence": round(avg_confidence, 1),
-            "onboarding_path_length": len([n for n in all_nodes if n.is_onboarding_path]),
-            "recommended_reading_count": len(
-                [n for n in all_nodes if n.is_recommended_reading]
-            ),
+            "onboarding_path_length": onboarding_count,
+            "recommended_reading_count": recommended_count,
         }
 
     def _create_empty_project_map(self, root_path: Path) -> ProjectMap:
@@ -414,20 +484,11 @@ class ProjectMapBuilder:
 
     def _estimate_reading_time(self, node: TreeNode) -> str:
         """估算閱讀時間。"""
-        base_time = 10  # 基礎 10 分鐘
-        complexity_bonus = len(node.capabilities) * 3
-        confidence_factor = (100 - node.confidence) / 100 * 5
-        total_time = base_time + complexity_bonus + confidence_factor
-        return f"{int(total_time)}-{int(total_time * 1.5)} 分鐘"
+        return _reading_time_for(len(node.capabilities), node.confidence)
 
     def _assess_difficulty(self, node: TreeNode) -> str:
         """評估難度。"""
-        if node.confidence >= 80 and len(node.capabilities) <= 3:
-            return "easy"
-        elif node.confidence >= 60 and len(node.capabilities) <= 6:
-            return "medium"
-        else:
-            return "hard"
+        return _difficulty_for(len(node.capabilities), node.confidence)
 
     def _assess_overall_difficulty(self, nodes: List[TreeNode]) -> str:
         """評估整體難度。"""
@@ -473,39 +534,46 @@ def validate_project_map(project_map: ProjectMap) -> List[str]:
     Returns:
         驗證錯誤列表，空列表表示驗證通過
     """
-    errors = []
+    return list(_iter_project_map_errors(project_map))
+
+
+def is_project_map_valid(project_map: ProjectMap) -> bool:
+    """判斷項目地圖是否有效，遇到第一個錯誤即停止遍歷。"""
+    return next(_iter_project_map_errors(project_map), None) is None
 
+
+def _iter_project_map_errors(project_map: ProjectMap) -> Iterator[str]:
+    """逐個產出項目地圖的驗證錯誤。"""
     # 基本字段驗證
     if not project_map.project_name:
-        errors.append("項目名稱不能為空")
+        yield "項目名稱不能為空"
 
     if not project_map.root_path:
-        errors.append("根路徑不能為空")
+        yield "根路徑不能為空"
 
     # 樹結構驗證
     if not project_map.tree:
-        errors.append("項目樹不能為空")
+        yield "項目樹不能為空"
     else:
-        tree_errors = _validate_tree_node(project_map.tree)
-        errors.extend(tree_errors)
+        yield from _iter_tree_node_errors(project_map.tree)
 
     # 引導路徑驗證
-    if project_map.onboarding_path.steps:
-        for i, step in enumerate(project_map.onboarding_path.steps):
-            if not step.get("title"):
-                errors.append(f"引導路徑步驟 {i+1} 缺少標題")
-            if not step.get("path"):
-                errors.append(f"引導路徑步驟 {i+1} 缺少路徑")
-
-    return errors
+    for i, step in enumerate(project_map.onboarding_path.steps):
+        if not step.get("title"):
+            yield f"引導路徑步驟 {i+1} 缺少標題"
+        if not step.get("path"):
+            yield f"引導路徑步驟 {i+1} 缺少路徑"
 
 
 def _validate_tree_node(node: TreeNode, path_prefix: str = "") -> List[str]:
     """驗證樹節點的有效性。"""
-    errors = []
+    return list(_iter_tree_node_errors(node, path_prefix))
 
+
+def _iter_tree_node_errors(node: TreeNode, path_prefix: str = "") -> Iterator[str]:
+    """逐個產出樹節點及其子節點的驗證錯誤。"""
     if not node.name:
-        errors.append(f"節點 {path_prefix} 缺少名稱")
+        yield f"節點 {path_prefix} 缺少名稱"
 
     if node.kind not in [
         "service",
@@ -517,15 +585,12 @@ def _validate_tree_node(node: TreeNode, path_prefix: str = "") -> List[str]:
         "docs",
         "unknown",
     ]:
-        errors.append(f"節點 {path_prefix} 類型無效: {node.kind}")
+        yield f"節點 {path_prefix} 類型無效: {node.kind}"
 
     if not 0 <= node.confidence <= 100:
-        errors.append(f"節點 {path_prefix} 置信度無效: {node.confidence}")
+        yield f"節點 {path_prefix} 置信度無效: {node.confidence}"
 
     # 遞歸驗證子節點
     for child in node.children:
         child_path = f"{path_prefix}/{child.name}" if path_prefix else child.name
-        child_errors = _validate_tree_node(child, child_path)
-        errors.extend(child_errors)
-
-    return errors
\ No newline at end of file
+        yield from _iter_tree_node_errors(child, child_path)
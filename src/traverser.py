@@ -11,12 +11,60 @@
 
 import fnmatch
 import mimetypes
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Union
 
 from .config import DigginSettings
 from .logger import get_logger
 
+# Ignore checks only look at the name, so scandir entries work as well as paths
+PathOrEntry = Union[Path, "os.DirEntry[str]"]
+
+
+class _GlobMatcher:
+    """Match names against ignore globs, sorted by how cheaply they match.
+
+    Literal names go into a set and ``*.ext`` patterns into a suffix tuple;
+    only the remaining patterns are compiled into a single regex.
+    """
+
+    __slots__ = ("exact", "suffixes", "regex")
+
+    def __init__(self, patterns: List[str]):
+        exact = set()
+        suffixes = []
+        rest = []
+        # fnmatch ignores case on case-insensitive platforms; leave those to re
+        case_sensitive = os.path.normcase("A") == "A"
+        for pattern in patterns:
+            if not case_sensitive:
+                rest.append(pattern)
+            elif not any(c in pattern for c in "*?["):
+                exact.add(pattern)
+            elif pattern[:2] == "*." and not any(c in pattern[1:] for c in "*?["):
+                suffixes.append(pattern[1:])
+            else:
+                rest.append(pattern)
+
+        self.exact = frozenset(exact)
+        self.suffixes = tuple(suffixes)
+        self.regex: Optional[Pattern[str]] = None
+        if rest:
+            flags = 0 if case_sensitive else re.IGNORECASE
+            self.regex = re.compile("|".join(fnmatch.translate(p) for p in rest), flags)
+
+    def match(self, name: str) -> bool:
+        """Return True if name matches any of the patterns."""
+        return (
+            name in self.exact
+            or name.endswith(self.suffixes)
+            or (self.regex is not None and self.regex.match(name) is not None)
+        )
+
 
 class DirectoryTraverser:
     """Handles directory scanning and file collection."""
@@ -29,6 +77,27 @@ class DirectoryTraverser:
         """
         self.settings = settings
         self.logger = get_logger("traverser")
+        # Parsed once so the per-file size gate is a plain integer compare
+        self._max_file_bytes = settings.get_max_file_size_bytes()
+        # Ignore rules are matched per entry, so compile them up front
+        self._ignore_hidden = settings.ignore_hidden
+        self._ignore_dirs = _GlobMatcher(settings.ignore_dirs)
+        self._ignore_files = _GlobMatcher(settings.ignore_files)
+        self._include_exts = frozenset(e.lower() for e in settings.include_extensions)
+        # Decisions depend only on the name, which repeats a lot across a tree
+        self._is_ignored_dir_name = lru_cache(maxsize=4096)(self._check_dir_name)
+        self._is_ignored_file_name = lru_cache(maxsize=4096)(self._check_file_name)
+        # Created on first use, only when traversal_workers > 1
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def close(self) -> None:
+        """Shut down the file-reading thread pool, if one was started.
+
+        The traverser stays usable; a later traversal starts a new pool.
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
 
     def find_leaf_directories(self, root_path: Path) -> List[Path]:
         """Find all leaf directories (directories with no subdirectories).
@@ -41,22 +110,15 @@ class DirectoryTraverser:
         """
         leaf_dirs = []
 
-        def _scan_directory(directory: Path):
+        def _scan_directory(directory: Union[str, Path]) -> None:
             """Recursively scan directory, avoiding ignored ones."""
-            try:
-                subdirs = []
-                for child in directory.iterdir():
-                    if child.is_dir() and not self._should_ignore_directory(child):
-                        subdirs.append(child)
-            except PermissionError:
-                self.logger.warning(
-                    f"Permission denied accessing directory: {directory}"
-                )
+            subdirs = self._list_subdirectories(directory)
+            if subdirs is None:
                 return
 
             # If no subdirectories, this is a leaf
             if not subdirs:
-                leaf_dirs.append(directory)
+                leaf_dirs.append(Path(directory))
                 return
 
             # Otherwise, recursively scan subdirectories
@@ -70,68 +132,56 @@ class DirectoryTraverser:
         return sorted(leaf_dirs)
 
     def get_analysis_order(self, root_path: Path) -> List[Path]:
-        """Get directories in bottom-up analysis order."""
-        leaf_dirs = self.find_leaf_directories(root_path)
-        analysis_order = leaf_dirs.copy()
-        processed = set(leaf_dirs)
-        current_level = leaf_dirs
-
-        while current_level:
-            next_level = self._get_next_level_parents(
-                current_level, processed, root_path
-            )
-            analysis_order.extend(next_level)
-            current_level = next_level
+        """Get directories in bottom-up analysis order.
 
-        if root_path not in analysis_order:
-            analysis_order.append(root_path)
-
-        return analysis_order
+        Each directory comes after all of its subdirectories, so the root
+        always comes last.
+        """
+        return [Path(directory) for directory in self._walk_postorder(str(root_path))]
 
-    def _get_next_level_parents(
-        self, current_level: List[Path], processed: set, root_path: Path
-    ) -> List[Path]:
-        """Get parent directories ready for next level processing."""
-        next_level = []
+    def _walk_postorder(self, root: str) -> Iterator[str]:
+        """Yield directory paths in post-order, keeping them as strings.
 
-        for directory in current_level:
-            parent = directory.parent
+        Args:
+            root: Directory to start from (always yielded, last)
 
-            if self._should_skip_parent(parent, root_path, processed):
+        Yields:
+            Directory paths, children before their parent
+        """
+        stack = [(root, iter(self._list_subdirectories(root) or ()))]
+
+        while stack:
+            directory, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                yield directory
                 continue
 
-            if (
-                self._all_children_processed(parent, processed)
-                and parent not in next_level
-            ):
-                next_level.append(parent)
-                processed.add(parent)
+            # Unreadable subdirectories are skipped (and logged) entirely
+            grandchildren = self._list_subdirectories(child)
+            if grandchildren is not None:
+                stack.append((child, iter(grandchildren)))
 
-        return next_level
+    def _list_subdirectories(self, directory: Union[str, Path]) -> Optional[List[str]]:
+        """List subdirectories worth analyzing, sorted by path.
 
-    def _should_skip_parent(
-        self, parent: Path, root_path: Path, processed: set
-    ) -> bool:
-        """Check if parent should be skipped."""
-        return (
-            parent == root_path.parent
-            or parent in processed
-            or self._should_ignore_directory(parent)
-        )
+        Args:
+            directory: Directory to scan
 
-    def _all_children_processed(self, parent: Path, processed: set) -> bool:
-        """Check if all children of parent have been processed."""
+        Returns:
+            Subdirectory paths, or None if the directory cannot be read
+        """
         try:
-            for child in parent.iterdir():
-                if (
-                    child.is_dir()
-                    and not self._should_ignore_directory(child)
-                    and child not in processed
-                ):
-                    return False
-            return True
+            with os.scandir(directory) as entries:
+                return sorted(
+                    entry.path
+                    for entry in entries
+                    if entry.is_dir() and not self._should_ignore_directory(entry)
+                )
         except PermissionError:
-            return False
+            self.logger.warning(f"Permission denied accessing directory: {directory}")
+            return None
 
     def collect_directory_info(self, directory: Path) -> Dict[str, Any]:
         """Collect detailed information about a directory.
@@ -151,91 +201,127 @@ class DirectoryTraverser:
             "total_size": 0,
         }
 
+        file_entries = []
         try:
-            for item in directory.iterdir():
-                if item.is_file() and not self._should_ignore_file(item):
-                    file_info = self._collect_file_info(item)
-                    if file_info:
-                        info["files"].append(file_info)
-                        info["total_files"] += 1
-                        info["total_size"] += file_info.get("size", 0)
-
-                elif item.is_dir() and not self._should_ignore_directory(item):
-                    info["subdirs"].append({"name": item.name, "path": str(item)})
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and not self._should_ignore_file(entry):
+                        file_entries.append(entry)
+
+                    elif entry.is_dir() and not self._should_ignore_directory(entry):
+                        info["subdirs"].append({"name": entry.name, "path": entry.path})
         except PermissionError:
             pass
 
+        for file_info in self._map_file_info(file_entries):
+            if file_info:
+                info["files"].append(file_info)
+                info["total_files"] += 1
+                info["total_size"] += file_info.get("size", 0)
+
         return info
 
-    def _collect_file_info(self, file_path: Path) -> Optional[Dict[str, Any]]:
+    def _map_file_info(
+        self, entries: List["os.DirEntry[str]"]
+    ) -> Iterable[Optional[Dict[str, Any]]]:
+        """Collect file information for entries, preserving their order.
+
+        Reads are I/O bound and release the GIL, so with traversal_workers > 1
+        they run on a shared thread pool; the pool size also bounds open files.
+        """
+        workers = self.settings.traversal_workers
+        if workers <= 1 or len(entries) < 2:
+            return map(self._collect_file_info, entries)
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="digin-traverser"
+            )
+        return self._pool.map(self._collect_file_info, entries)
+
+    def _collect_file_info(self, entry: "os.DirEntry[str]") -> Optional[Dict[str, Any]]:
         """Collect information about a single file.
 
         Args:
-            file_path: File to analyze
+            entry: Scandir entry of the file to analyze
 
         Returns:
             File information dictionary or None if file should be skipped
         """
         try:
-            stat = file_path.stat()
-            max_size = self.settings.get_max_file_size_bytes()
+            # DirEntry caches its stat result, so this is the only stat call
+            stat = entry.stat()
 
             # Skip files that are too large
-            if stat.st_size > max_size:
+            if stat.st_size > self._max_file_bytes:
                 self.logger.debug(
-                    f"Skipping large file ({stat.st_size} bytes): {file_path}"
+                    f"Skipping large file ({stat.st_size} bytes): {entry.path}"
                 )
                 return None
 
-            file_info = {
-                "name": file_path.name,
-                "path": str(file_path),
-                "size": stat.st_size,
-                "extension": file_path.suffix.lower(),
-                "is_text": self._is_text_file(file_path),
-            }
+            # Extension/mimetype settle most files without touching the content
+            is_text = self._is_text_name(entry.name)
 
             # Add content preview for text files with generous limits for AI analysis
             # Use larger limits for modern AI models with large context windows
             max_file_size = 100 * 1024  # 100KB per file (up from 8KB)
             max_content_read = 50 * 1024  # Read up to 50KB per file (up from 2KB)
+            wants_preview = stat.st_size <= max_file_size
 
-            if file_info["is_text"] and stat.st_size <= max_file_size:
+            # One binary read serves both the text sniff and the preview.
+            # The preview limit counts characters, which take up to 4 bytes
+            # in UTF-8, so read enough bytes to fill it with CJK text too
+            sample = b""
+            if wants_preview or not is_text:
                 try:
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        content = f.read(max_content_read)
-                        if content.strip():
-                            file_info["content_preview"] = content
-                except (UnicodeDecodeError, PermissionError) as e:
-                    self.logger.debug(
-                        f"Failed to read content preview for {file_path}: {e}"
-                    )
-                    pass
+                    with open(entry, "rb") as f:
+                        sample = f.read(max_content_read * 4 if wants_preview else 1024)
+                    if not is_text:
+                        is_text = self._sample_is_text(sample[:1024])
+                except PermissionError as e:
+                    self.logger.debug(f"Failed to read {entry.path}: {e}")
+
+            file_info = {
+                "name": entry.name,
+                "path": entry.path,
+                "size": stat.st_size,
+                "extension": os.path.splitext(entry.name)[1].lower(),
+                "is_text": is_text,
+            }
+
+            if is_text and wants_preview:
+                # Same result as a text-mode read: universal newlines, then the limit
+                content = sample.decode("utf-8", errors="ignore")
+                content = content.replace("\r\n", "\n").replace("\r", "\n")
+                content = content[:max_content_read]
+                if content.strip():
+                    file_info["content_preview"] = content
 
             return file_info
 
         except (OSError, PermissionError):
             return None
 
-    def _should_ignore_directory(self, directory: Path) -> bool:
+    def _should_ignore_directory(self, directory: PathOrEntry) -> bool:
         """Check if directory should be ignored.
 
         Args:
-            directory: Directory to check
+            directory: Directory path or scandir entry to check
 
         Returns:
             True if directory should be ignored
         """
-        dir_name = directory.name
+        return self._is_ignored_dir_name(directory.name)
 
+    def _check_dir_name(self, dir_name: str) -> bool:
+        """Apply directory ignore rules to a bare name (memoized per instance)."""
         # Check if it's a hidden directory (starts with .)
-        if self.settings.ignore_hidden and dir_name.startswith("."):
+        if self._ignore_hidden and dir_name[:1] == ".":
             return True
 
         # Check against ignore patterns
-        for pattern in self.settings.ignore_dirs:
-            if fnmatch.fnmatch(dir_name, pattern):
-                return True
+        if self._ignore_dirs.match(dir_name):
+            return True
 
         return False
 
@@ -248,63 +334,82 @@ class DirectoryTraverser:
         """Public: whether file should be ignored (wrapper)."""
         return self._should_ignore_file(file_path)
 
-    def _should_ignore_file(self, file_path: Path) -> bool:
+    def _should_ignore_file(self, file_path: PathOrEntry) -> bool:
         """Check if file should be ignored.
 
         Args:
-            file_path: File to check
+            file_path: File path or scandir entry to check
 
         Returns:
             True if file should be ignored
         """
-        file_name = file_path.name
-        extension = file_path.suffix.lower()
+        return self._is_ignored_file_name(file_path.name)
 
+    def _check_file_name(self, file_name: str) -> bool:
+        """Apply file ignore rules to a bare name (memoized per instance)."""
         # Check if it's a hidden file (starts with .)
-        if self.settings.ignore_hidden and file_name.startswith("."):
+        if self._ignore_hidden and file_name[:1] == ".":
             return True
 
         # Check against ignore patterns
-        for pattern in self.settings.ignore_files:
-            if fnmatch.fnmatch(file_name, pattern):
-                return True
+        if self._ignore_files.match(file_name):
+            return True
 
         # Check if extension is in include list
-        if self.settings.include_extensions:
-            return extension not in self.settings.include_extensions
+        if self._include_exts:
+            extension = os.path.splitext(file_name)[1].lower()
+            return extension not in self._include_exts
 
         return False
 
-    def _is_text_file(self, file_path: Path) -> bool:
+    def _is_text_file(self, file_path: PathOrEntry) -> bool:
         """Determine if file is a text file.
 
         Args:
-            file_path: File to check
+            file_path: File path or scandir entry to check
 
         Returns:
             True if file appears to be text
         """
-        # Check by extension first
-        extension = file_path.suffix.lower()
-        if extension in self.settings.include_extensions:
-            return True
-
-        # Use mimetypes to guess
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if mime_type and mime_type.startswith("text/"):
+        if self._is_text_name(file_path.name):
             return True
 
         # Try to read a small sample
         try:
             with open(file_path, "rb") as f:
-                sample = f.read(1024)
-                # Check if sample contains mostly printable characters
-                if len(sample) == 0:
-                    return True
-
-                text_chars = sum(
-                    1 for byte in sample if byte in b"\t\n\r" or 32 <= byte <= 126
-                )
-                return text_chars / len(sample) > 0.7
+                return self._sample_is_text(f.read(1024))
         except (OSError, PermissionError):
             return False
+
+    def _is_text_name(self, file_name: str) -> bool:
+        """Check whether a file name alone marks the file as text.
+
+        Args:
+            file_name: Base name of the file
+
+        Returns:
+            True if the extension or guessed mimetype is textual
+        """
+        # Check by extension first
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension in self._include_exts:
+            return True
+
+        # Use mimetypes to guess
+        mime_type, _ = mimetypes.guess_type(file_name)
+        return bool(mime_type and mime_type.startswith("text/"))
+
+    def _sample_is_text(self, sample: bytes) -> bool:
+        """Check whether a leading byte sample looks like text.
+
+        Args:
+            sample: Up to the first 1KB of the file
+
+        Returns:
+            True if the sample is mostly printable characters
+        """
+        if len(sample) == 0:
+            return True
+
+        text_chars = sum(1 for byte in sample if byte in b"\t\n\r" or 32 <= byte <= 126)
+        return text_chars / len(sample) > 0.7
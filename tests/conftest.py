@@ -0,0 +1,15 @@
+"""Shared pytest configuration."""
+
+import os
+import sys
+import tempfile
+
+SHM_DIR = "/dev/shm"
+
+
+def pytest_configure(config):
+    """Keep tmp_path trees in RAM on Linux unless TMPDIR says otherwise."""
+    if os.environ.get("TMPDIR") or config.option.basetemp:
+        return
+    if sys.platform.startswith("linux") and os.access(SHM_DIR, os.W_OK):
+        tempfile.tempdir = SHM_DIR
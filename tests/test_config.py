@@ -18,6 +18,7 @@ class TestDigginSettings:
         assert settings.api_provider == "claude"
         assert settings.cache_enabled is True
         assert settings.parallel_workers == 1
+        assert settings.traversal_workers == 1
         assert settings.verbose is False
 
     def test_get_max_file_size_bytes(self):
@@ -0,0 +1,192 @@
+"""Tests for the logging handler and AI command log helpers."""
+
+import json
+import logging
+import time
+from unittest.mock import patch
+
+import pytest
+
+import src.logger as logger_module
+from src.logger import (
+    FormatOnceRotatingFileHandler,
+    JsonMessage,
+    _elapsed_ms,
+    log_ai_command,
+)
+
+
+class CountingFormatter(logging.Formatter):
+    """Formatter that counts how often it is asked to format a record."""
+
+    def __init__(self, fmt: str = "%(message)s") -> None:
+        super().__init__(fmt)
+        self.calls = 0
+
+    def format(self, record: logging.LogRecord) -> str:
+        self.calls += 1
+        return super().format(record)
+
+
+@pytest.fixture
+def file_handler(tmp_path):
+    """Rotating handler writing plain messages to tmp_path/test.log."""
+    handler = FormatOnceRotatingFileHandler(
+        tmp_path / "test.log", maxBytes=1024 * 1024, backupCount=1, encoding="utf-8"
+    )
+    handler.setFormatter(CountingFormatter())
+    yield handler
+    handler.close()
+
+
+@pytest.fixture
+def ai_logger(file_handler, monkeypatch):
+    """Route the AI command logger to file_handler in JSON mode."""
+    monkeypatch.setattr(logger_module, "_ai_logging_enabled", True)
+    monkeypatch.setattr(logger_module, "_ai_log_format", "json")
+    monkeypatch.setattr(logger_module, "_ai_log_detail_level", "full")
+    monkeypatch.setattr(logger_module, "_ai_log_prompt_max_chars", 10)
+
+    logger = logging.getLogger("digin.ai_commands")
+    saved = (logger.handlers[:], logger.level, logger.propagate)
+    logger.handlers = [file_handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield logger
+    logger.handlers, level, logger.propagate = saved
+    logger.setLevel(level)
+
+
+def _log_lines(handler):
+    handler.flush()
+    with open(handler.baseFilename, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+@pytest.mark.unit
+class TestFormatOnceRotatingFileHandler:
+    """Test FormatOnceRotatingFileHandler."""
+
+    def test_formats_each_record_once(self, file_handler):
+        """Test rollover sizing and writing share one formatted string."""
+        logger = logging.getLogger("format_once_test")
+        logger.propagate = False
+        logger.addHandler(file_handler)
+        try:
+            logger.warning("first")
+            logger.warning("second")
+        finally:
+            logger.removeHandler(file_handler)
+
+        assert file_handler.formatter.calls == 2
+        assert _log_lines(file_handler) == ["first", "second"]
+
+    def test_releases_record_after_emit(self, file_handler):
+        """Test the handler drops its formatted-record cache after emit."""
+        logger = logging.getLogger("format_once_test")
+        logger.propagate = False
+        logger.addHandler(file_handler)
+        try:
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("failed")
+        finally:
+            logger.removeHandler(file_handler)
+
+        assert file_handler._last_record is None
+        assert file_handler._last_text == ""
+        content = "\n".join(_log_lines(file_handler))
+        assert content.count("failed") == 1
+        assert "ValueError: boom" in content
+
+
+@pytest.mark.unit
+class TestJsonMessage:
+    """Test lazily encoded JSON log messages."""
+
+    def test_encodes_once(self):
+        """Test the payload is encoded on first use and then reused."""
+        message = JsonMessage({"provider": "claude", "目錄": "src"})
+
+        with patch.object(logger_module, "dumps", wraps=logger_module.dumps) as dumps:
+            first = str(message)
+            second = str(message)
+
+        assert dumps.call_count == 1
+        assert first is second
+        assert json.loads(first) == {"provider": "claude", "目錄": "src"}
+
+    def test_not_encoded_when_dropped(self):
+        """Test a record below the logger level never encodes its payload."""
+        logger = logging.getLogger("json_message_test")
+        logger.setLevel(logging.WARNING)
+
+        with patch.object(logger_module, "dumps") as dumps:
+            logger.info(JsonMessage({"a": 1}))
+
+        dumps.assert_not_called()
+
+
+@pytest.mark.unit
+class TestElapsedMs:
+    """Test duration measurement for both start time formats."""
+
+    def test_perf_counter_ns_start(self):
+        """Test an int start is read as a perf_counter_ns() value."""
+        start = time.perf_counter_ns() - 1_500_000_000
+
+        assert 1500 <= _elapsed_ms(start) < 1600
+
+    def test_legacy_time_start(self):
+        """Test a float start is read as a time.time() value."""
+        start = time.time() - 1.5
+
+        assert 1500 <= _elapsed_ms(start) < 1600
+
+
+@pytest.mark.unit
+class TestLogAiCommand:
+    """Test log_ai_command output and early return."""
+
+    def _log(self, **overrides):
+        kwargs = {
+            "provider": "claude",
+            "command": ["claude", "-p"],
+            "prompt_size": 42,
+            "directory": "src/核心",
+            "start_time": time.perf_counter_ns(),
+            "success": False,
+            "response_size": 0,
+            "error_msg": "",
+            "prompt": "分析這個目錄的代碼結構",
+        }
+        kwargs.update(overrides)
+        log_ai_command(**kwargs)
+
+    def test_json_round_trip(self, ai_logger, file_handler):
+        """Test a JSON-mode entry decodes back to the logged fields."""
+        self._log()
+
+        lines = _log_lines(file_handler)
+        assert len(lines) == 1
+        entry = json.loads(lines[0])
+        assert entry["provider"] == "claude"
+        assert entry["command"] == ["claude", "-p"]
+        assert entry["directory"] == "src/核心"
+        assert entry["prompt_size"] == 42
+        assert entry["success"] is False
+        assert entry["error_msg"] is None
+        assert entry["prompt_preview"] == "分析這個目錄的代碼結構"[:10]
+        assert isinstance(entry["duration_ms"], int)
+        assert file_handler.formatter.calls == 1
+
+    def test_skipped_when_info_disabled(self, ai_logger, file_handler):
+        """Test nothing is measured or built when INFO records are dropped."""
+        ai_logger.setLevel(logging.WARNING)
+
+        with patch.object(logger_module, "_elapsed_ms") as elapsed:
+            self._log()
+
+        elapsed.assert_not_called()
+        assert _log_lines(file_handler) == []
@@ -1,6 +1,8 @@
 """測試項目地圖構建功能。"""
 
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
@@ -10,11 +12,21 @@ from src.project_map import (
     TreeNode,
     OnboardingPath,
     ProjectMap,
+    is_project_map_valid,
     validate_project_map,
 )
 from src.config import DigginSettings
 
 
+def write_digests(root, rels, payload=None):
+    """在 root 下各相對目錄寫入 digest.json，payload 缺省為 {"name": 相對路徑}。"""
+    for rel in rels:
+        directory = root / rel
+        directory.mkdir(parents=True, exist_ok=True)
+        data = {"name": rel} if payload is None else payload
+        (directory / "digest.json").write_text(json.dumps(data))
+
+
 class TestProjectMapBuilder:
     """測試項目地圖構建器。"""
 
@@ -60,6 +72,37 @@ class TestProjectMapBuilder:
                 assert "" in digest_files  # 根目錄
                 assert "subdir" in digest_files
 
+    def test_collect_digest_files_nested(self, tmp_path):
+        """測試嵌套目錄的 digest 文件使用 / 分隔的相對路徑作為鍵。"""
+        write_digests(tmp_path, ["", "src", "src/auth"], {"kind": "lib"})
+
+        digest_files = self.builder._collect_digest_files(tmp_path)
+
+        assert sorted(digest_files) == ["", "src", "src/auth"]
+
+    def test_collect_digest_files_relative_root(self, tmp_path, monkeypatch):
+        """測試根路徑為相對路徑 "." 時的鍵。"""
+        write_digests(tmp_path, ["", "sub", "sub/b"], {"kind": "lib"})
+        monkeypatch.chdir(tmp_path)
+
+        digest_files = self.builder._collect_digest_files(Path("."))
+
+        assert sorted(digest_files) == ["", "sub", "sub/b"]
+
+    def test_collect_digest_files_with_executor(self, tmp_path):
+        """測試使用執行器並行讀取 digest 文件，結果與串行一致。"""
+        write_digests(tmp_path, ["", "src", "src/auth", "docs"])
+        (tmp_path / "broken").mkdir()
+        (tmp_path / "broken" / "digest.json").write_text("{not json")
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            builder = ProjectMapBuilder(DigginSettings(), executor=executor)
+            parallel = builder._collect_digest_files(tmp_path)
+
+        assert parallel == self.builder._collect_digest_files(tmp_path)
+        assert sorted(parallel) == ["", "docs", "src", "src/auth"]
+        assert parallel["src/auth"] == {"name": "src/auth"}
+
     def test_build_tree_structure(self):
         """測試樹結構構建。"""
         root_path = Path("/test/project")
@@ -106,6 +149,21 @@ class TestProjectMapBuilder:
         assert auth_node.kind == "service"
         assert len(auth_node.children) == 0
 
+    def test_build_tree_structure_child_listed_before_root(self):
+        """測試子節點先於根節點出現時仍能正確掛載。"""
+        root_path = Path("/test/project")
+        digest_files = {
+            "src/auth": {"name": "auth", "kind": "service"},
+            "src": {"name": "src", "kind": "lib"},
+            "": {"name": "project", "kind": "infra"},
+        }
+
+        tree = self.builder._build_tree_structure(root_path, digest_files)
+
+        assert tree.name == "project"
+        assert [child.name for child in tree.children] == ["src"]
+        assert [child.name for child in tree.children[0].children] == ["auth"]
+
     def test_calculate_importance_scores(self):
         """測試重要性評分計算。"""
         # 創建測試樹
@@ -357,6 +415,23 @@ class TestProjectMapBuilder:
         assert stats["onboarding_path_length"] == 1
         assert stats["recommended_reading_count"] == 1
 
+    def test_deep_tree_does_not_recurse(self):
+        """測試深度超過遞歸上限的樹也能完成評分、引導路徑與統計。"""
+        depth = sys.getrecursionlimit() + 100
+        paths = ["/".join(["d"] * level) for level in range(depth)]
+        digest = {"kind": "lib", "confidence": 90, "capabilities": ["解析", "緩存"]}
+        digest_files = {path: digest for path in paths}
+        tree = self.builder._build_tree_structure(Path("/project"), digest_files)
+
+        self.builder._calculate_importance_scores(tree)
+        onboarding_path = self.builder._generate_onboarding_path(tree)
+        recommended = self.builder._select_recommended_reading(tree)
+        stats = self.builder._calculate_statistics(tree, digest_files)
+
+        assert onboarding_path.total_steps > 0
+        assert recommended
+        assert stats["total_modules"] == depth
+
 
 class TestProjectMapValidation:
     """測試項目地圖驗證功能。"""
@@ -394,6 +469,27 @@ class TestProjectMapValidation:
         assert len(errors) > 0
         assert any("項目名稱不能為空" in error for error in errors)
 
+    def test_is_project_map_valid(self):
+        """測試項目地圖有效性的快速判斷。"""
+        tree = TreeNode(
+            name="test", path="", kind="service", summary="測試", confidence=80
+        )
+        valid_map = ProjectMap(
+            project_name="test_project",
+            root_path="/test",
+            tree=tree,
+            onboarding_path=OnboardingPath(),
+        )
+        invalid_map = ProjectMap(
+            project_name="",
+            root_path="/test",
+            tree=tree,
+            onboarding_path=OnboardingPath(),
+        )
+
+        assert is_project_map_valid(valid_map)
+        assert not is_project_map_valid(invalid_map)
+
     def test_validate_tree_node(self):
         """測試樹節點驗證。"""
         from src.project_map import _validate_tree_node
@@ -450,6 +546,19 @@ class TestTreeNode:
         assert len(parent.children) == 1
         assert parent.children[0] == child
 
+    def test_tree_node_flags(self):
+        """測試引導路徑與推薦閱讀標記共用位域。"""
+        node = TreeNode(name="flags", path="flags", kind="lib", summary="標記")
+
+        node.is_onboarding_path = True
+        node.is_recommended_reading = True
+        assert node.is_onboarding_path
+        assert node.is_recommended_reading
+
+        node.is_onboarding_path = False
+        assert not node.is_onboarding_path
+        assert node.is_recommended_reading
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -1,5 +1,6 @@
 """Tests for directory traversal functionality."""
 
+import os
 from pathlib import Path
 
 import pytest
@@ -8,9 +9,64 @@ from src.config import DigginSettings
 from src.traverser import DirectoryTraverser
 
 
+def make_tree(root, spec):
+    """Create files from (relpath, content) pairs in a single pass.
+
+    Content may be None (empty file) or bytes; a relpath ending in "/"
+    creates an empty directory instead.
+    """
+    root = str(root)
+    for rel, data in spec:
+        path = os.path.join(root, rel)
+        if rel.endswith("/"):
+            os.makedirs(path, exist_ok=True)
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            if data:
+                f.write(data)
+
+
+def build_sample_tree(root: Path) -> Path:
+    """Create the read-only directory layouts shared by traversal tests."""
+    make_tree(
+        root,
+        [
+            # Leaf detection layout
+            ("leaves/src/lib/core.py", None),
+            ("leaves/src/utils/helpers.py", None),
+            ("leaves/docs/README.md", None),
+            ("leaves/tests/unit/test_core.py", None),
+            ("leaves/node_modules/", None),  # Should be ignored
+            # Bottom-up ordering layout
+            ("nested/app/services/auth/login.py", None),
+            ("nested/app/services/user/model.py", None),
+            ("nested/app/utils/helpers.py", None),
+            ("nested/app/main.py", None),
+            # Binary vs text layout
+            ("binary/test.bin", b"\x00\x01\x02\xff" * 100),
+            ("binary/test.py", b"print('hello')"),
+        ],
+    )
+    return root
+
+
+@pytest.fixture(scope="session")
+def sample_tree(tmp_path_factory):
+    """Build the shared sample tree once per test session."""
+    return build_sample_tree(tmp_path_factory.mktemp("tree"))
+
+
 class TestDirectoryTraverser:
     """Test DirectoryTraverser functionality."""
 
+    @staticmethod
+    def _rel(paths, root):
+        """Render paths relative to root ("." for root itself) by slicing."""
+        root_str = str(root)
+        prefix_len = len(root_str) + len(os.sep)
+        return ["." if str(p) == root_str else str(p)[prefix_len:] for p in paths]
+
     @pytest.fixture
     def settings(self):
         """Create test settings."""
@@ -26,49 +82,28 @@ class TestDirectoryTraverser:
         """Create DirectoryTraverser instance."""
         return DirectoryTraverser(settings)
 
-    def test_find_leaf_directories(self, traverser, tmp_path):
+    def test_find_leaf_directories(self, traverser, sample_tree):
         """Test finding leaf directories."""
-        # Create directory structure
-        (tmp_path / "src" / "lib").mkdir(parents=True)
-        (tmp_path / "src" / "utils").mkdir(parents=True)
-        (tmp_path / "docs").mkdir()
-        (tmp_path / "tests" / "unit").mkdir(parents=True)
-        (tmp_path / "node_modules").mkdir()  # Should be ignored
-
-        # Add files to make directories non-empty
-        (tmp_path / "src" / "lib" / "core.py").touch()
-        (tmp_path / "src" / "utils" / "helpers.py").touch()
-        (tmp_path / "docs" / "README.md").touch()
-        (tmp_path / "tests" / "unit" / "test_core.py").touch()
-
-        leaf_dirs = traverser.find_leaf_directories(tmp_path)
+        root = sample_tree / "leaves"
+        leaf_dirs = traverser.find_leaf_directories(root)
 
         # Convert to relative paths for easier testing
-        relative_paths = [str(d.relative_to(tmp_path)) for d in leaf_dirs]
+        relative_paths = self._rel(leaf_dirs, root)
 
         assert "src/lib" in relative_paths
         assert "src/utils" in relative_paths
         assert "docs" in relative_paths
         assert "tests/unit" in relative_paths
-        assert not any("node_modules" in path for path in relative_paths)
+        path_parts = {part for path in relative_paths for part in path.split(os.sep)}
+        assert "node_modules" not in path_parts
 
-    def test_get_analysis_order(self, traverser, tmp_path):
+    def test_get_analysis_order(self, traverser, sample_tree):
         """Test getting analysis order (bottom-up)."""
-        # Create nested structure
-        (tmp_path / "app" / "services" / "auth").mkdir(parents=True)
-        (tmp_path / "app" / "services" / "user").mkdir(parents=True)
-        (tmp_path / "app" / "utils").mkdir(parents=True)
-
-        # Add files
-        (tmp_path / "app" / "services" / "auth" / "login.py").touch()
-        (tmp_path / "app" / "services" / "user" / "model.py").touch()
-        (tmp_path / "app" / "utils" / "helpers.py").touch()
-        (tmp_path / "app" / "main.py").touch()
-
-        analysis_order = traverser.get_analysis_order(tmp_path)
+        root = sample_tree / "nested"
+        analysis_order = traverser.get_analysis_order(root)
 
         # Convert to relative paths
-        relative_paths = [str(d.relative_to(tmp_path)) for d in analysis_order]
+        relative_paths = self._rel(analysis_order, root)
 
         # Leaf directories should come first
         auth_idx = relative_paths.index("app/services/auth")
@@ -83,25 +118,23 @@ class TestDirectoryTraverser:
         assert user_idx < services_idx < app_idx < root_idx
         assert utils_idx < app_idx < root_idx
 
+        # Every directory appears exactly once, root last
+        assert len(relative_paths) == len(set(relative_paths)) == 6
+        assert relative_paths[-1] == "."
+
     def test_collect_directory_info(self, traverser, tmp_path):
         """Test collecting directory information."""
         # Create test files
         test_dir = tmp_path / "test_module"
-        test_dir.mkdir()
-
-        # Python file with content
-        py_file = test_dir / "module.py"
-        py_file.write_text("def hello():\n    return 'world'\n")
-
-        # JavaScript file
-        js_file = test_dir / "script.js"
-        js_file.write_text("console.log('hello');")
-
-        # File to ignore
-        (test_dir / "cache.pyc").touch()
-
-        # Subdirectory
-        (test_dir / "subdir").mkdir()
+        make_tree(
+            test_dir,
+            [
+                ("module.py", b"def hello():\n    return 'world'\n"),
+                ("script.js", b"console.log('hello');"),
+                ("cache.pyc", None),  # File to ignore
+                ("subdir/", None),
+            ],
+        )
 
         info = traverser.collect_directory_info(test_dir)
 
@@ -124,6 +157,53 @@ class TestDirectoryTraverser:
         assert "content_preview" in py_file_info
         assert "def hello" in py_file_info["content_preview"]
 
+    def test_content_preview_matches_text_mode_read(self, traverser, tmp_path):
+        """Test the preview limit counts characters and newlines are normalised."""
+        make_tree(
+            tmp_path,
+            [
+                ("cjk.md", "中文內容".encode("utf-8") * 6500),  # 26,000 chars, 78KB
+                ("crlf.py", b"x = 1\r\ny = 2\r\nz = 3\r"),
+                ("long.md", b"a" * 60 * 1024),
+            ],
+        )
+
+        info = traverser.collect_directory_info(tmp_path)
+        previews = {f["name"]: f["content_preview"] for f in info["files"]}
+
+        assert previews["cjk.md"] == "中文內容" * 6500
+        assert len(previews["long.md"]) == 50 * 1024
+        assert previews["crlf.py"] == "x = 1\ny = 2\nz = 3\n"
+
+    def test_collect_directory_info_parallel(self, settings, tmp_path):
+        """Test threaded file collection matches the serial result."""
+        for i in range(8):
+            (tmp_path / f"module_{i}.py").write_bytes(b"value = %d\n" % i)
+        (tmp_path / "cache.pyc").touch()
+
+        serial = DirectoryTraverser(settings).collect_directory_info(tmp_path)
+        settings.traversal_workers = 4
+        parallel = DirectoryTraverser(settings).collect_directory_info(tmp_path)
+
+        assert parallel == serial
+        assert parallel["total_files"] == 8
+
+    def test_close_shuts_down_pool(self, settings, tmp_path):
+        """Test close() releases the thread pool and later traversals still work."""
+        for i in range(4):
+            (tmp_path / f"module_{i}.py").write_bytes(b"value = %d\n" % i)
+        settings.traversal_workers = 2
+        traverser = DirectoryTraverser(settings)
+
+        traverser.collect_directory_info(tmp_path)
+        pool = traverser._pool
+        traverser.close()
+
+        assert pool is not None and pool._shutdown
+        assert traverser._pool is None
+        assert traverser.collect_directory_info(tmp_path)["total_files"] == 4
+        traverser.close()
+
     def test_should_ignore_directory(self, traverser):
         """Test directory ignore logic."""
         assert traverser._should_ignore_directory(Path("node_modules"))
@@ -179,6 +259,24 @@ class TestDirectoryTraverser:
         assert traverser._should_ignore_file(Path("image.png"))
         assert traverser._should_ignore_file(Path("data.csv"))
 
+    def test_should_ignore_file_glob_patterns(self):
+        """Test literal, suffix and general glob patterns together."""
+        settings = DigginSettings(
+            ignore_files=["*.pyc", "yarn.lock", "*.egg-info", "test_*.py", "*.min.*"],
+            include_extensions=[],
+        )
+        traverser = DirectoryTraverser(settings)
+
+        assert traverser._should_ignore_file(Path("module.pyc"))
+        assert traverser._should_ignore_file(Path("yarn.lock"))
+        assert traverser._should_ignore_file(Path("digin.egg-info"))
+        assert traverser._should_ignore_file(Path("test_core.py"))
+        assert traverser._should_ignore_file(Path("app.min.js"))
+
+        assert not traverser._should_ignore_file(Path("core.py"))
+        assert not traverser._should_ignore_file(Path("yarn.lock.bak"))
+        assert not traverser._should_ignore_file(Path("pyc"))
+
     def test_should_ignore_hidden_files(self, traverser):
         """Test hidden file ignore logic."""
         # Should ignore hidden files when ignore_hidden=True (default)
@@ -264,13 +362,19 @@ class TestDirectoryTraverser:
         assert not traverser._is_text_file(Path("image.png"))
         assert not traverser._is_text_file(Path("data.bin"))
 
-    def test_large_file_handling(self, traverser, tmp_path):
+    def test_large_file_handling(self, traverser, tmp_path, monkeypatch):
         """Test handling of large files."""
         large_file = tmp_path / "large.py"
 
-        # Create file larger than max_file_size
-        large_content = "# Large file\n" * 100000  # Much larger than 1MB when repeated
-        large_file.write_text(large_content)
+        # Create a sparse file larger than max_file_size (1MB)
+        with open(large_file, "wb") as f:
+            f.truncate(2 * 1024 * 1024)
+
+        # The size gate must reject the file before it is ever opened
+        def fail_open(*args, **kwargs):
+            raise AssertionError("oversized file was opened")
+
+        monkeypatch.setattr("src.traverser.open", fail_open, raising=False)
 
         info = traverser.collect_directory_info(tmp_path)
 
@@ -281,13 +385,13 @@ class TestDirectoryTraverser:
     def test_permission_error_handling(self, traverser, tmp_path, monkeypatch):
         """Test handling of permission errors."""
         test_dir = tmp_path / "restricted"
-        test_dir.mkdir()
+        make_tree(test_dir, [("module.py", b"x = 1\n"), ("subdir/", None)])
 
         # Mock permission error
-        def mock_iterdir(self):
+        def mock_scandir(path):
             raise PermissionError("Access denied")
 
-        monkeypatch.setattr(Path, "iterdir", mock_iterdir)
+        monkeypatch.setattr(os, "scandir", mock_scandir)
 
         # Should not raise exception
         info = traverser.collect_directory_info(test_dir)
@@ -297,17 +401,9 @@ class TestDirectoryTraverser:
         assert len(info["files"]) == 0
         assert len(info["subdirs"]) == 0
 
-    def test_binary_file_detection(self, traverser, tmp_path):
+    def test_binary_file_detection(self, traverser, sample_tree):
         """Test binary file detection."""
-        # Create binary file
-        binary_file = tmp_path / "test.bin"
-        binary_file.write_bytes(b"\x00\x01\x02\xff" * 100)
-
-        # Create text file
-        text_file = tmp_path / "test.py"
-        text_file.write_text("print('hello')")
-
-        info = traverser.collect_directory_info(tmp_path)
+        info = traverser.collect_directory_info(sample_tree / "binary")
 
         # Only text file should be included and have content preview
         assert len(info["files"]) == 1
@@ -327,21 +423,20 @@ class TestDirectoryTraverser:
         traverser = DirectoryTraverser(settings)
 
         # Create mixed visible and hidden directories
-        (tmp_path / "src").mkdir()
-        (tmp_path / "docs").mkdir()
-        (tmp_path / ".git").mkdir()
-        (tmp_path / ".vscode").mkdir()
-        (tmp_path / ".claude").mkdir()
-        (tmp_path / ".cursor").mkdir()
-
-        # Add some files to make directories detectable
-        (tmp_path / "src" / "main.py").write_text("print('main')")
-        (tmp_path / "docs" / "README.md").write_text("# Docs")
-        (tmp_path / ".git" / "config").write_text("[core]")
-        (tmp_path / ".vscode" / "settings.json").write_text("{}")
+        make_tree(
+            tmp_path,
+            [
+                ("src/main.py", b"print('main')"),
+                ("docs/README.md", b"# Docs"),
+                (".git/config", b"[core]"),
+                (".vscode/settings.json", b"{}"),
+                (".claude/", None),
+                (".cursor/", None),
+            ],
+        )
 
         leaf_dirs = traverser.find_leaf_directories(tmp_path)
-        relative_paths = [str(d.relative_to(tmp_path)) for d in leaf_dirs]
+        relative_paths = self._rel(leaf_dirs, tmp_path)
 
         # Should only find visible directories
         assert "src" in relative_paths
@@ -362,12 +457,17 @@ class TestDirectoryTraverser:
         traverser = DirectoryTraverser(settings)
 
         # Create mixed visible and hidden files
-        (tmp_path / "main.py").write_text("print('main')")
-        (tmp_path / "README.md").write_text("# README")
-        (tmp_path / ".env").write_text("SECRET=123")
-        (tmp_path / ".gitignore").write_text("*.pyc")
-        (tmp_path / ".DS_Store").write_bytes(b"\x00\x01\x02")
-        (tmp_path / ".vscode").mkdir()
+        make_tree(
+            tmp_path,
+            [
+                ("main.py", b"print('main')"),
+                ("README.md", b"# README"),
+                (".env", b"SECRET=123"),
+                (".gitignore", b"*.pyc"),
+                (".DS_Store", b"\x00\x01\x02"),
+                (".vscode/", None),
+            ],
+        )
 
         info = traverser.collect_directory_info(tmp_path)
 
@@ -395,21 +495,20 @@ class TestDirectoryTraverser:
 
         # Test with root directory named 'dist' (should be ignored)
         dist_root = tmp_path / "dist"
-        dist_root.mkdir()
 
         # Create structure inside 'dist' root
-        (dist_root / "src").mkdir()
-        (dist_root / "src" / "main.py").touch()
-        (dist_root / "tests").mkdir()
-        (dist_root / "tests" / "test.py").touch()
-
-        # Create a nested 'dist' directory (should be ignored)
-        (dist_root / "nested_dist").mkdir()
-        (dist_root / "nested_dist" / "file.js").touch()
+        make_tree(
+            dist_root,
+            [
+                ("src/main.py", None),
+                ("tests/test.py", None),
+                ("nested_dist/file.js", None),
+            ],
+        )
 
         # Test find_leaf_directories - root should still be scanned
         leaf_dirs = traverser.find_leaf_directories(dist_root)
-        relative_paths = [str(d.relative_to(dist_root)) for d in leaf_dirs]
+        relative_paths = self._rel(leaf_dirs, dist_root)
 
         # Should find leaf directories inside the 'dist' root
         assert "src" in relative_paths
@@ -418,7 +517,7 @@ class TestDirectoryTraverser:
 
         # Test analysis order - root should be included
         analysis_order = traverser.get_analysis_order(dist_root)
-        relative_analysis = [str(d.relative_to(dist_root)) for d in analysis_order]
+        relative_analysis = self._rel(analysis_order, dist_root)
 
         assert "src" in relative_analysis
         assert "tests" in relative_analysis
@@ -435,19 +534,19 @@ class TestDirectoryTraverser:
 
         # Create root directory named 'build'
         build_root = tmp_path / "build"
-        build_root.mkdir()
 
-        # Create content in build root
-        (build_root / "main.py").touch()
-        (build_root / "src").mkdir()
-        (build_root / "src" / "app.py").touch()
-
-        # Create nested 'build' directory (should be ignored)
-        (build_root / "build").mkdir()  # This should be ignored
-        (build_root / "build" / "output.py").touch()
+        # Create content in build root, plus a nested 'build' to be ignored
+        make_tree(
+            build_root,
+            [
+                ("main.py", None),
+                ("src/app.py", None),
+                ("build/output.py", None),
+            ],
+        )
 
         leaf_dirs = traverser.find_leaf_directories(build_root)
-        relative_paths = [str(d.relative_to(build_root)) for d in leaf_dirs]
+        relative_paths = self._rel(leaf_dirs, build_root)
 
         # Root 'build' directory should be scanned, so 'src' should be found
         assert "src" in relative_paths
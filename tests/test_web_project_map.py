@@ -6,7 +6,7 @@ from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 
-from web.server import DiginWebServer, create_app
+from web.server import ROOT_DIGEST_TTL, DiginWebServer, create_app
 from src.project_map import ProjectMap, TreeNode, OnboardingPath
 
 
@@ -227,6 +227,93 @@ class TestDiginWebServerProjectMap:
             response = client.get("/api/info")
             assert response.status_code == 200
 
+    def test_io_pool_shut_down_with_app(self, tmp_path):
+        """測試應用關閉時釋放 IO 線程池。"""
+        server = DiginWebServer(tmp_path)
+
+        with TestClient(server.app) as client:
+            assert client.get("/api/info").status_code == 200
+            assert not server._io_pool._shutdown
+
+        assert server._io_pool._shutdown
+
+    def test_has_root_digest_cached_for_ttl(self, tmp_path):
+        """測試根 digest.json 存在性在 ROOT_DIGEST_TTL 內復用，過期後重新檢查。"""
+        client = TestClient(create_app(tmp_path))
+
+        def has_root_digest(now):
+            with patch("web.server.time.monotonic", return_value=now):
+                return client.get("/api/info").json()["has_root_digest"]
+
+        assert has_root_digest(1000.0) is False
+        (tmp_path / "digest.json").write_bytes(b"{}")
+        assert has_root_digest(1000.0 + ROOT_DIGEST_TTL - 0.1) is False
+        assert has_root_digest(1000.0 + ROOT_DIGEST_TTL) is True
+
+    def test_static_cache_control(self):
+        """測試靜態資源帶短時緩存頭，304 響應同樣帶上。"""
+        first = self.client.get("/static/app.js")
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "public, max-age=300"
+
+        second = self.client.get(
+            "/static/app.js", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert second.status_code == 304
+        assert second.headers["cache-control"] == "public, max-age=300"
+
+    def test_index_weak_etag(self):
+        """測試主頁使用弱 ETag（響應可能被 GZip 壓縮），命中時返回 304。"""
+        first = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+        etag = first.headers["etag"]
+        assert first.headers["content-encoding"] == "gzip"
+        assert etag.startswith('W/"')
+
+        second = self.client.get("/", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+
+    def test_project_map_cached_until_digest_changes(self, tmp_path):
+        """測試根 digest.json 未變化時復用已序列化的項目地圖。"""
+        digest_file = tmp_path / "digest.json"
+        digest_file.write_bytes(b"{}")
+        server = DiginWebServer(tmp_path)
+        client = TestClient(server.app)
+
+        with patch.object(
+            server, "_build_project_map", return_value={"project_name": "cached"}
+        ) as mock_build:
+            assert client.get("/api/project-map").json()["project_name"] == "cached"
+            assert client.get("/api/project-map").status_code == 200
+            assert mock_build.call_count == 1
+
+            # 重新分析後 digest.json 改變，緩存失效
+            digest_file.write_bytes(b'{"name": "changed"}')
+            client.get("/api/project-map")
+            assert mock_build.call_count == 2
+
+    def test_project_map_encode_error(self):
+        """測試項目地圖編碼失敗時返回帶說明的 500。"""
+        with patch.object(
+            DiginWebServer, "_build_project_map", return_value={"bad": object()}
+        ):
+            response = self.client.get("/api/project-map")
+
+        assert response.status_code == 500
+        assert "构建项目地图失败" in response.json()["detail"]
+
+    @pytest.mark.parametrize("kind", [None, 3])
+    def test_project_map_non_string_kind(self, tmp_path, kind):
+        """測試非字符串的 kind 作為統計鍵時仍能正常序列化。"""
+        digest = {"name": "root", "kind": kind, "summary": "根目錄"}
+        (tmp_path / "digest.json").write_text(json.dumps(digest), encoding="utf-8")
+        client = TestClient(create_app(tmp_path))
+
+        response = client.get("/api/project-map")
+
+        assert response.status_code == 200
+        kind_distribution = response.json()["statistics"]["kind_distribution"]
+        assert kind_distribution == {json.dumps(kind): 1}
+
     def test_narrative_fields_in_response(self):
         """測試響應中的敘述字段。"""
         # 創建帶敘述字段的樹節點
@@ -444,5 +531,123 @@ class TestWebProjectMapIntegration:
             assert "測試錯誤" in error_data["detail"]
 
 
+class TestDigestEndpoint:
+    """測試 digest.json 讀取端點。"""
+
+    def test_digest_returned_verbatim(self, tmp_path):
+        """測試 digest.json 原樣返回。"""
+        raw = json.dumps({"name": "根目錄", "kind": "service"}, ensure_ascii=False)
+        (tmp_path / "digest.json").write_bytes(raw.encode("utf-8"))
+        client = TestClient(create_app(tmp_path))
+
+        response = client.get("/api/digest")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == raw.encode("utf-8")
+        assert response.json()["name"] == "根目錄"
+
+    def test_digest_etag_not_modified(self, tmp_path):
+        """測試 If-None-Match 命中時返回 304。"""
+        (tmp_path / "digest.json").write_bytes(b'{"name": "root"}')
+        client = TestClient(create_app(tmp_path))
+
+        first = client.get("/api/digest")
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+
+        second = client.get("/api/digest", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+
+        # 文件變化後 ETag 不再匹配
+        (tmp_path / "digest.json").write_bytes(b'{"name": "changed"}')
+        third = client.get("/api/digest", headers={"If-None-Match": etag})
+        assert third.status_code == 200
+        assert third.headers["etag"] != etag
+
+    def test_digest_rewritten_while_serving(self, tmp_path):
+        """測試打開後被原地重寫的 digest.json，響應長度與響應體一致。"""
+        digest_file = tmp_path / "digest.json"
+        digest_file.write_bytes(b'{"name": "root"}')
+        server = DiginWebServer(tmp_path)
+        client = TestClient(server.app)
+        open_digest_file = server._open_digest_file
+
+        def open_then_rewrite(path):
+            f = open_digest_file(path)
+            # 與 CacheManager.save_cache 相同，非原子地原地重寫
+            digest_file.write_text(json.dumps({"name": "root", "summary": "重新分析"}))
+            return f
+
+        with patch.object(server, "_open_digest_file", side_effect=open_then_rewrite):
+            response = client.get("/api/digest")
+
+        assert response.status_code == 200
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert response.json()["summary"] == "重新分析"
+
+    def test_sibling_directory_with_shared_prefix_rejected(self, tmp_path):
+        """測試經符號鏈接指向共享前綴的兄弟目錄時被拒絕。"""
+        project = tmp_path / "project"
+        evil = tmp_path / "project-evil"
+        project.mkdir()
+        evil.mkdir()
+        (evil / "digest.json").write_bytes(b'{"secret": true}')
+        # 解析後為 .../project-evil，與目標目錄字符串前綴相同
+        (project / "link").symlink_to(evil, target_is_directory=True)
+        client = TestClient(create_app(project))
+
+        response = client.get("/api/digest", params={"path": "link"})
+
+        assert response.status_code == 403
+
+    def test_directory_replaced_by_symlink_rejected(self, tmp_path):
+        """測試已訪問過的目錄被替換為指向目錄外的符號鏈接後被拒絕。"""
+        project = tmp_path / "project"
+        outside = tmp_path / "outside"
+        (project / "sub").mkdir(parents=True)
+        outside.mkdir()
+        (project / "sub" / "digest.json").write_bytes(b'{"name": "sub"}')
+        (outside / "digest.json").write_bytes(b'{"secret": true}')
+        client = TestClient(create_app(project))
+        assert client.get("/api/digest", params={"path": "sub"}).status_code == 200
+
+        (project / "sub" / "digest.json").unlink()
+        (project / "sub").rmdir()
+        (project / "sub").symlink_to(outside, target_is_directory=True)
+
+        response = client.get("/api/digest", params={"path": "sub"})
+
+        assert response.status_code == 403
+
+    @pytest.mark.parametrize("path", ["..", "../project-evil", "sub/..", "/sub/../.."])
+    def test_parent_reference_rejected(self, tmp_path, path):
+        """測試含 ".." 的路徑不經解析直接拒絕，即使結果仍在目標目錄內（如 sub/..）。"""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "digest.json").write_bytes(b'{"name": "root"}')
+        client = TestClient(create_app(tmp_path))
+
+        response = client.get("/api/digest", params={"path": path})
+
+        assert response.status_code == 403
+
+    def test_malformed_digest(self, tmp_path):
+        """測試格式錯誤的 digest.json 返回 500。"""
+        (tmp_path / "digest.json").write_bytes(b"{not json")
+        client = TestClient(create_app(tmp_path))
+
+        response = client.get("/api/digest")
+
+        assert response.status_code == 500
+        assert "格式错误" in response.json()["detail"]
+
+        # 空文件同樣按格式錯誤處理
+        (tmp_path / "digest.json").write_bytes(b"")
+        response = client.get("/api/digest")
+        assert response.status_code == 500
+        assert "格式错误" in response.json()["detail"]
+
+
 if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])
@@ -71,7 +71,8 @@ def main() -> None:
     print("⏹️  按 Ctrl+C 停止服务")
     print()
 
-    # 启动服务器
+    # 启动服务器：单进程即可（缓存按进程保存）；安装 web 依赖后
+    # uvicorn 默认的 loop/http="auto" 会自动选用 uvloop 与 httptools
     try:
         uvicorn.run(
             app,
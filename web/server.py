@@ -3,21 +3,101 @@
 简单的只读服务，用于展示 digest.json 文件内容。
 """
 
-import json
-from pathlib import Path
-from typing import Any, Dict, Optional
-
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import FileResponse
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import cached_property
+from pathlib import Path, PurePosixPath
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Optional, Tuple
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
-# Import project map functionality
-import sys
-sys.path.append(str(Path(__file__).parent.parent))
+from src._json import dumps_bytes, loads
 from src.project_map import ProjectMapBuilder
 from src.config import DigginSettings
 
 
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    """返回文件的 (mtime_ns, size)，文件不可访问时返回 None。"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _make_etag(key: Tuple[int, int]) -> str:
+    """由 (mtime_ns, size) 生成弱 ETag。"""
+    return f'W/"{key[0]:x}-{key[1]:x}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """按弱比较规则判断 If-None-Match 是否命中。"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = _opaque_tag(etag)
+    return any(_opaque_tag(tag.strip()) == opaque for tag in header.split(","))
+
+
+def _opaque_tag(etag: str) -> str:
+    """去掉弱 ETag 的 W/ 前缀。"""
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _conditional_response(
+    request: Request, key: Optional[Tuple[int, int]], build: Callable[[], Response]
+) -> Response:
+    """返回带 ETag 的响应，客户端缓存仍有效时返回 304。
+
+    Args:
+        request: 当前请求
+        key: 数据源文件的 (mtime_ns, size)，None 表示不可缓存
+        build: 生成完整响应的函数，仅在需要响应体时调用
+    """
+    if key is None:
+        return build()
+
+    headers = {"ETag": _make_etag(key), "Cache-Control": "no-cache"}
+    if _etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response = build()
+    response.headers.update(headers)
+    return response
+
+
+# /api/info 中根 digest.json 存在性检查的缓存时长（秒）
+ROOT_DIGEST_TTL = 5.0
+
+# 静态资源文件名不带内容哈希，只缓存短时间，过期后凭 ETag 重新验证
+STATIC_CACHE_CONTROL = "public, max-age=300"
+
+
+class CachedStaticFiles(StaticFiles):
+    """为静态资源响应添加 Cache-Control 头。"""
+
+    def file_response(self, *args: Any, **kwargs: Any) -> Response:
+        """在父类的文件响应上补充缓存头。"""
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", STATIC_CACHE_CONTROL)
+        return response
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 orjson（若已安装）编码的 JSON 响应。"""
+
+    def render(self, content: Any) -> bytes:
+        """编码为紧凑的 UTF-8 JSON。"""
+        return dumps_bytes(content)
+
+
 class DiginWebServer:
     """Digin Web 服务器类。"""
 
@@ -28,106 +108,251 @@ class DiginWebServer:
             target_path: 分析的目标目录（包含 digest.json 文件）
         """
         self.target_path = target_path.resolve()
-        self.app = FastAPI(title="Digin Web Viewer", version="0.1.0")
+        # 带结尾分隔符的前缀，避免 /a/project 误匹配 /a/project-evil
+        self._target_str = str(self.target_path)
+        self._target_prefix = os.path.join(self._target_str, "")
+        # 项目地图缓存：(根 digest.json 的 (mtime_ns, size), 序列化后的字节)
+        self._root_digest = self.target_path / "digest.json"
+        # /api/info 的 has_root_digest 结果缓存：(检查时刻, 是否存在)
+        self._root_digest_seen: Optional[Tuple[float, bool]] = None
+        self._map_cache: Optional[Tuple[Tuple[int, int], bytes]] = None
+        # 跨请求共享的 IO 线程池，供项目地图构建并行读取 digest 文件；应用关闭时释放
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="digin-web-io"
+        )
+        self.app = FastAPI(
+            title="Digin Web Viewer",
+            version="0.1.0",
+            default_response_class=FastJSONResponse,
+            lifespan=self._lifespan,
+        )
+        # 嵌套的 JSON 压缩率很高；小于 1KB 的响应不值得压缩
+        self.app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
         self._setup_routes()
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """应用生命周期：关闭时等待并释放 IO 线程池。"""
+        try:
+            yield
+        finally:
+            self._io_pool.shutdown()
+
     def _setup_routes(self) -> None:
         """设置路由。"""
         # 挂载静态文件
         static_path = Path(__file__).parent / "static"
-        self.app.mount("/static", StaticFiles(directory=static_path), name="static")
+        self.app.mount(
+            "/static", CachedStaticFiles(directory=static_path), name="static"
+        )
+
+        # 主页启动时读入内存，请求时不再访问磁盘；ETag 取内容哈希。
+        # 响应会经 GZip 压缩，压缩前后的响应体不同，只能使用弱 ETag
+        index_bytes = (static_path / "index.html").read_bytes()
+        index_headers = {
+            "ETag": f'W/"{hashlib.sha256(index_bytes).hexdigest()[:32]}"',
+            "Cache-Control": "no-cache",
+        }
 
         # 根路径返回主页
-        @self.app.get("/")
-        async def root() -> FileResponse:
-            """返回主页。"""
-            return FileResponse(static_path / "index.html")
+        @self.app.get("/", response_class=HTMLResponse)
+        async def root(request: Request) -> Response:
+            """返回主页。每次都需重新验证，以便及时拿到新的脚本与样式引用。"""
+            if _etag_matches(request, index_headers["ETag"]):
+                return Response(status_code=304, headers=index_headers)
+            return HTMLResponse(content=index_bytes, headers=index_headers)
+
+        # API 路由均含阻塞的磁盘 IO，定义为普通函数由 FastAPI 放入线程池执行，
+        # 避免阻塞事件循环
 
         # API 路由：获取 digest.json
-        @self.app.get("/api/digest")
-        async def get_digest(path: str = Query("/", description="目录路径")) -> Dict[str, Any]:
+        @self.app.get("/api/digest", response_class=FastJSONResponse)
+        def get_digest(
+            request: Request, path: str = Query("/", description="目录路径")
+        ) -> Response:
             """获取指定路径的 digest.json 内容。
 
             Args:
+                request: 当前请求（用于 If-None-Match 协商）
                 path: 相对于目标目录的路径
 
             Returns:
-                digest.json 的内容
+                digest.json 的原始内容（不经二次序列化），未变化时返回 304
 
             Raises:
                 HTTPException: 路径不安全或文件不存在
             """
-            return self._read_digest_safely(path)
+            # 分析时 digest.json 会被原地重写；ETag 与响应体都取自同一个
+            # 文件描述符，且 Content-Length 按实际读到的字节计算，不会错位
+            with self._open_digest_file(path) as f:
+                stat = os.fstat(f.fileno())
+
+                def build() -> Response:
+                    content = self._read_digest_file(f)
+                    return Response(content=content, media_type="application/json")
+
+                return _conditional_response(
+                    request, (stat.st_mtime_ns, stat.st_size), build
+                )
 
         # API 路由：获取目录信息
-        @self.app.get("/api/info")
-        async def get_info() -> Dict[str, Any]:
+        @self.app.get("/api/info", response_class=FastJSONResponse)
+        def get_info() -> FastJSONResponse:
             """获取目标目录基本信息。"""
-            return {
+            return FastJSONResponse({
                 "target_path": str(self.target_path),
                 "target_name": self.target_path.name,
-                "has_root_digest": (self.target_path / "digest.json").exists()
-            }
+                "has_root_digest": self._has_root_digest()
+            })
 
         # API 路由：获取项目地图
-        @self.app.get("/api/project-map")
-        async def get_project_map() -> Dict[str, Any]:
+        @self.app.get("/api/project-map", response_class=FastJSONResponse)
+        def get_project_map(request: Request) -> Response:
             """获取项目地图数据，包含树结构和引导路径。
 
+            返回缓存的已编码字节，跳过 jsonable_encoder 对整棵树的遍历。
+
+            Args:
+                request: 当前请求（用于 If-None-Match 协商）
+
             Returns:
-                项目地图数据
+                项目地图数据，根 digest.json 未变化时返回 304
 
             Raises:
                 HTTPException: 生成项目地图失败
             """
-            return self._build_project_map()
+            key = _stat_key(self._root_digest)
+
+            def build() -> Response:
+                content = self._project_map_bytes(key)
+                return Response(content=content, media_type="application/json")
 
-    def _read_digest_safely(self, relative_path: str) -> Dict[str, Any]:
-        """安全地读取 digest.json 文件。
+            return _conditional_response(request, key, build)
+
+    def _resolve_subdir(self, relative_path: str) -> Path:
+        """将相对路径解析为目标目录内的真实路径。
 
         Args:
-            relative_path: 相对路径
+            relative_path: 去掉开头 "/" 的相对路径
 
         Returns:
-            digest.json 内容
+            解析后的目录路径
 
         Raises:
-            HTTPException: 路径不安全或文件不存在
+            HTTPException: 路径不安全或格式无效
         """
-        # 规范化路径
-        if relative_path.startswith("/"):
-            relative_path = relative_path[1:]
+        # 词法检查：含 ".." 的路径不访问磁盘直接拒绝
+        parts = PurePosixPath(relative_path).parts
+        if ".." in parts:
+            raise HTTPException(status_code=403, detail="路径不安全：不能访问目标目录外的文件")
 
-        # 构建完整路径
-        if relative_path:
-            full_path = self.target_path / relative_path
-        else:
-            full_path = self.target_path
+        if not parts:
+            # 目标目录在初始化时已解析，根目录请求无需再 resolve
+            return self.target_path
 
-        # 安全检查：确保路径在目标目录内
+        # 子目录可能经由符号链接指向目录外，且链接随时可能被替换，
+        # 每次请求都需重新解析后检查，结果不能缓存
         try:
-            resolved_path = full_path.resolve()
-            if not str(resolved_path).startswith(str(self.target_path)):
-                raise HTTPException(status_code=403, detail="路径不安全：不能访问目标目录外的文件")
+            resolved_path = (self.target_path / relative_path).resolve()
         except (OSError, ValueError):
             raise HTTPException(status_code=400, detail="无效的路径格式")
+        resolved_str = str(resolved_path)
+        if resolved_str != self._target_str and not resolved_str.startswith(
+            self._target_prefix
+        ):
+            raise HTTPException(status_code=403, detail="路径不安全：不能访问目标目录外的文件")
+        return resolved_path
+
+    def _has_root_digest(self) -> bool:
+        """根目录是否有 digest.json，结果缓存 ROOT_DIGEST_TTL 秒。"""
+        now = time.monotonic()
+        seen = self._root_digest_seen
+        if seen is None or now - seen[0] >= ROOT_DIGEST_TTL:
+            seen = (now, self._root_digest.exists())
+            self._root_digest_seen = seen
+        return seen[1]
+
+    def _open_digest_file(self, relative_path: str) -> BinaryIO:
+        """安全地打开 digest.json 文件。
+
+        Args:
+            relative_path: 相对路径
+
+        Returns:
+            以二进制模式打开的 digest.json，由调用方关闭
+
+        Raises:
+            HTTPException: 路径不安全或文件不存在
+        """
+        # 规范化路径
+        relative_path = relative_path.lstrip("/")
+        resolved_path = self._resolve_subdir(relative_path)
 
         # 检查 digest.json 是否存在
-        digest_file = resolved_path / "digest.json"
-        if not digest_file.exists():
+        try:
+            return open(resolved_path / "digest.json", "rb")
+        except OSError:
             raise HTTPException(
                 status_code=404,
                 detail=f"未找到 digest.json 文件：{relative_path or '根目录'}"
             )
 
-        # 读取并返回内容
+    def _read_digest_file(self, f: BinaryIO) -> bytes:
+        """读取 digest.json 并校验为合法 JSON。
+
+        Args:
+            f: 已打开的 digest.json
+
+        Returns:
+            文件的原始字节（不经二次序列化）
+
+        Raises:
+            HTTPException: 文件格式错误或读取失败
+        """
         try:
-            with open(digest_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
+            data = f.read()
+            loads(data)
+        except ValueError:
             raise HTTPException(status_code=500, detail="digest.json 文件格式错误")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"读取文件失败：{str(e)}")
+        return data
+
+    def _project_map_bytes(self, key: Optional[Tuple[int, int]]) -> bytes:
+        """获取序列化后的项目地图，根 digest.json 未变化时直接复用缓存。
+
+        分析自底向上进行，根目录的 digest.json 总是最后写入，
+        因此以它的 mtime 和大小作为整棵树是否变化的标志。
+
+        Args:
+            key: 根 digest.json 的 (mtime_ns, size)，None 表示不缓存
+
+        Returns:
+            项目地图的 JSON 字节
+
+        Raises:
+            HTTPException: 构建或编码失败
+        """
+        cached = self._map_cache
+        if key is not None and cached is not None and cached[0] == key:
+            return cached[1]
+
+        project_map = self._build_project_map()
+        try:
+            data = dumps_bytes(project_map)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"构建项目地图失败：{str(e)}"
+            )
+        if key is not None:
+            self._map_cache = (key, data)
+        return data
+
+    @cached_property
+    def _builder(self) -> ProjectMapBuilder:
+        """项目地图构建器（无状态，首次使用时以默认配置创建并复用）。"""
+        return ProjectMapBuilder(DigginSettings(), executor=self._io_pool)
 
     def _build_project_map(self) -> Dict[str, Any]:
         """构建项目地图数据。
@@ -139,12 +364,8 @@ class DiginWebServer:
             HTTPException: 构建失败
         """
         try:
-            # 创建默认配置（用于项目地图生成）
-            settings = DigginSettings()
-
             # 构建项目地图
-            builder = ProjectMapBuilder(settings)
-            project_map = builder.build_project_map(self.target_path)
+            project_map = self._builder.build_project_map(self.target_path)
 
             # 转换为可序列化的字典
             return self._serialize_project_map(project_map)
@@ -164,8 +385,8 @@ class DiginWebServer:
         Returns:
             可序列化的字典
         """
-        def serialize_tree_node(node) -> Dict[str, Any]:
-            """递归序列化树节点。"""
+        def node_fields(node) -> Dict[str, Any]:
+            """序列化单个节点的字段，children 由下方循环填充。"""
             return {
                 "name": node.name,
                 "path": node.path,
@@ -177,18 +398,29 @@ class DiginWebServer:
                 "narrative": node.narrative,
                 "is_onboarding_path": node.is_onboarding_path,
                 "is_recommended_reading": node.is_recommended_reading,
-                "children": [serialize_tree_node(child) for child in node.children],
+                "children": [],
             }
 
+        # 用显式栈代替递归：子节点字典按原顺序挂到父节点上，深树也不会触及递归上限
+        tree = node_fields(project_map.tree)
+        stack = [(project_map.tree, tree)]
+        while stack:
+            node, data = stack.pop()
+            for child in node.children:
+                child_data = node_fields(child)
+                data["children"].append(child_data)
+                stack.append((child, child_data))
+
+        onboarding = project_map.onboarding_path
         return {
             "project_name": project_map.project_name,
             "root_path": project_map.root_path,
-            "tree": serialize_tree_node(project_map.tree),
+            "tree": tree,
             "onboarding_path": {
-                "steps": project_map.onboarding_path.steps,
-                "total_steps": project_map.onboarding_path.total_steps,
-                "estimated_time": project_map.onboarding_path.estimated_time,
-                "difficulty": project_map.onboarding_path.difficulty,
+                "steps": onboarding.steps,
+                "total_steps": onboarding.total_steps,
+                "estimated_time": onboarding.estimated_time,
+                "difficulty": onboarding.difficulty,
             },
             "recommended_reading": project_map.recommended_reading,
             "statistics": project_map.statistics,